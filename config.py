@@ -28,4 +28,21 @@ CHUNK_SIZE = 1000  # number of characters per chunk
 CHUNK_OVERLAP = 100  # overlap between chunks
 
 # Other settings
-EMBEDDING_DEVICE = "gpu"  # or "cuda" (GPU)
\ No newline at end of file
+EMBEDDING_DEVICE = "gpu"  # or "cuda" (GPU)
+
+# Retrieval
+# Generic probe queries used by CombinedRetriever to learn each store's distance distribution
+RETRIEVAL_CALIBRATION_QUERIES = [
+    "Total revenues for the year",
+    "Net income and earnings per share",
+    "Cash flows from operating activities",
+    "Total assets, liabilities and equity",
+    "Long-term debt and credit ratings",
+    "Research and development expenses",
+    "Dividends and share repurchases",
+    "Risk factors affecting the business",
+    "Acquisitions, collaborations and divestitures",
+    "Income tax provision and effective tax rate",
+    "Segment and geographic revenue breakdown",
+    "Legal proceedings and contingencies",
+]
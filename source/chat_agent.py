@@ -24,11 +24,10 @@ class PDFChatAgent:
         def search_pdf(query: str) -> str:
             """Searches the financial PDFs for relevant content based on the user query."""
             try:
-                result = self.retriever.query(query)
-                documents = result.get("documents", [[]])[0]
+                documents = self.retriever.get_relevant_documents(query)
                 if not documents:
                     return "No relevant information found in the financial documents."
-                return "\n\n".join(documents[:3])  # Return top 3 results
+                return "\n\n".join(f"{doc.metadata}\n{doc.page_content.strip()}" for doc in documents)
             except Exception as e:
                 return f"Error during document retrieval: {str(e)}"
 
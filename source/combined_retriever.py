@@ -0,0 +1,154 @@
+# combined_retriever.py
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from langchain_core.documents import Document
+from config import RETRIEVAL_CALIBRATION_QUERIES
+
+
+class CombinedRetriever:
+    """
+    Queries the text and table stores concurrently and returns one merged top-k.
+
+    Accepts the retrievers produced by `TextVectorStoreBuilder` / `TableVectorStoreBuilder`
+    (plain or summary-based) but only uses their vector stores and docstores: ranking is by
+    plain similarity with this class's `k` / `fetch_k`, not the builders' MMR settings.
+    Each store embeds the query with its own model in a separate thread.
+
+    fusion="calibrated" (default) scores every hit against its own store's distance
+    distribution over a fixed probe set (RETRIEVAL_CALIBRATION_QUERIES), so the two embedding
+    models' different similarity baselines cancel out before the lists are merged.
+    fusion="split" reproduces the previous fixed per-store slice (k // 2 from each store)
+    and is kept for comparison.
+    """
+
+    FUSION_MODES = ("calibrated", "split")
+
+    def __init__(self, text_retriever, table_retriever, k: int = 6, fetch_k: int = 20,
+                 fusion: str = "calibrated", calibration_queries: List[str] = None):
+        if fusion not in self.FUSION_MODES:
+            raise ValueError(f"Unknown fusion mode '{fusion}', expected one of {self.FUSION_MODES}")
+        self.k = k
+        self.fetch_k = fetch_k
+        self.fusion = fusion
+        self.stores = {
+            "text": text_retriever,
+            "table": table_retriever,
+        }
+        self.last_latency: Dict[str, Dict[str, float]] = {}
+        self.calibration: Dict[str, Tuple[float, float]] = {}
+        if fusion == "calibrated":
+            self.calibrate(calibration_queries or RETRIEVAL_CALIBRATION_QUERIES)
+
+    def _search_distances(self, retriever, query: str) -> Tuple[List[Tuple[Document, float]], float, float]:
+        vector_store = retriever.vectorstore
+
+        start = time.perf_counter()
+        query_embedding = vector_store.embeddings.embed_query(query)
+        embedded = time.perf_counter()
+        # Returns the collection's raw distance; lower means more similar
+        results = vector_store.similarity_search_by_vector_with_relevance_scores(
+            query_embedding, k=self.fetch_k
+        )
+        searched = time.perf_counter()
+        return results, embedded - start, searched - embedded
+
+    def _calibrate_store(self, retriever, queries: List[str]) -> Tuple[float, float]:
+        distances = []
+        for query in queries:
+            results, _, _ = self._search_distances(retriever, query)
+            distances.extend(distance for _, distance in results)
+
+        if len(distances) < 2:
+            return (distances[0] if distances else 0.0), 1.0
+        return statistics.fmean(distances), statistics.pstdev(distances) or 1.0
+
+    def calibrate(self, queries: List[str]):
+        """Records each store's mean / stdev distance over the probe queries."""
+        with ThreadPoolExecutor(max_workers=len(self.stores)) as executor:
+            futures = {
+                name: executor.submit(self._calibrate_store, retriever, queries)
+                for name, retriever in self.stores.items()
+            }
+            self.calibration = {name: future.result() for name, future in futures.items()}
+        print(f"[INFO] Retrieval calibration (mean, stdev distance): {self.calibration}")
+
+    def _search_store(self, name: str, retriever, query: str) -> Tuple[List[Tuple[Document, float]], Dict[str, float]]:
+        start = time.perf_counter()
+        results, embed_s, search_s = self._search_distances(retriever, query)
+
+        scored = self._score(name, results)
+        resolve_start = time.perf_counter()
+        scored = self._resolve_parents(retriever, scored)
+        end = time.perf_counter()
+
+        latency = {
+            "embed_ms": embed_s * 1000,
+            "search_ms": search_s * 1000,
+            "docstore_ms": (end - resolve_start) * 1000,
+            "total_ms": (end - start) * 1000,
+        }
+        return scored, latency
+
+    def _score(self, name: str, results: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+        """Higher is better. Calibrated: standard deviations closer than the store's typical hit; split: negated rank."""
+        if self.fusion == "split":
+            return [(doc, -float(rank)) for rank, (doc, _) in enumerate(results)]
+        mean, stdev = self.calibration[name]
+        return [(doc, (mean - distance) / stdev) for doc, distance in results]
+
+    @staticmethod
+    def _resolve_parents(retriever, scored: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+        """Maps summary hits back to their parent documents for summary-based stores."""
+        docstore = getattr(retriever, "docstore", None)
+        if docstore is None:
+            return scored
+
+        id_key = retriever.id_key
+        best_scores: Dict[str, float] = {}
+        for doc, score in scored:
+            doc_id = doc.metadata.get(id_key)
+            if doc_id is not None and doc_id not in best_scores:
+                best_scores[doc_id] = score
+
+        parent_ids = list(best_scores)
+        parents = docstore.mget(parent_ids)
+        return [
+            (parent, best_scores[doc_id])
+            for doc_id, parent in zip(parent_ids, parents)
+            if parent is not None
+        ]
+
+    def retrieve(self, query: str) -> Tuple[List[Tuple[Document, float, str]], Dict[str, Dict[str, float]]]:
+        """
+        Returns the merged top-k as (document, score, store name) tuples, best first
+        (store by store for fusion="split"), and a per-store latency breakdown (in ms).
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(self.stores)) as executor:
+            futures = {
+                name: executor.submit(self._search_store, name, retriever, query)
+                for name, retriever in self.stores.items()
+            }
+
+            merged = []
+            latency = {}
+            for name, future in futures.items():
+                scored, latency[name] = future.result()
+                if self.fusion == "split":
+                    scored = scored[:self.k // len(self.stores)]
+                for doc, score in scored:
+                    merged.append((doc, score, name))
+        latency["combined"] = {"total_ms": (time.perf_counter() - start) * 1000}
+
+        if self.fusion == "calibrated":
+            merged.sort(key=lambda item: item[1], reverse=True)
+            merged = merged[:self.k]
+        self.last_latency = latency
+        return merged, latency
+
+    def get_relevant_documents(self, query: str) -> List[Document]:
+        hits, _ = self.retrieve(query)
+        return [doc for doc, _, _ in hits]
@@ -2,9 +2,8 @@ from langchain_google_genai import GoogleGenerativeAI
 from config import GEMINI_API_KEY, CHAT_MODEL_NAME
 
 class FinancialAnalysisAgent:
-    def __init__(self, text_retriever, table_retriever):
-        self.text_retriever = text_retriever
-        self.table_retriever = table_retriever
+    def __init__(self, retriever):
+        self.retriever = retriever
         self.llm = GoogleGenerativeAI(
             model=CHAT_MODEL_NAME,
             google_api_key=GEMINI_API_KEY
@@ -73,11 +72,10 @@ class FinancialAnalysisAgent:
         combined_context = ""
 
         for query in queries:
-            # Get results from both retrievers
-            text_docs = self.text_retriever.get_relevant_documents(query)
-            table_docs = self.table_retriever.get_relevant_documents(query)            
-            
-            for doc in text_docs[:3] + table_docs[:3]:
+            # Merged top-k across the text and table stores
+            docs = self.retriever.get_relevant_documents(query)
+
+            for doc in docs:
                 # Include metadata in the context
                 meta_info = doc.metadata
                 content_block = f"{meta_info}\n{doc.page_content.strip()}\n\n"
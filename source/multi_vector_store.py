@@ -1,19 +1,136 @@
 # multi_vector_store.py
 
+import os
+import shutil
+import time
+import uuid
 from typing import List, Tuple
+from bs4 import BeautifulSoup
 from langchain.vectorstores import Chroma
 from langchain.embeddings import HuggingFaceEmbeddings
+from langchain.retrievers.multi_vector import MultiVectorRetriever, SearchType
+from langchain.storage import LocalFileStore, create_kv_docstore
 from langchain_core.documents import Document
-from config import TEXT_EMBEDDING_MODEL_NAME, TABLE_EMBEDDING_MODEL_NAME
+from config import TEXT_EMBEDDING_MODEL_NAME, TABLE_EMBEDDING_MODEL_NAME, CHUNK_SIZE
 
-class TextVectorStoreBuilder:
-    def __init__(self, persist_directory: str):
+# Metadata key linking an embedded summary to its parent in the document store
+DOC_ID_KEY = "doc_id"
+
+
+def _build_parent_documents(chunks: List, summaries: List[str]) -> List[Document]:
+    documents = []
+    for chunk, summary in zip(chunks, summaries):
+        doc = Document(
+            page_content=chunk.text,
+            metadata={
+                **chunk.metadata,
+                "summary": summary
+            }
+        )
+        documents.append(doc)
+    return documents
+
+
+def _extract_row_labels(table_html: str) -> str:
+    """Returns the non-numeric first-column labels of an HTML table, e.g. 'Total revenues; Net income'."""
+    soup = BeautifulSoup(table_html, "html.parser")
+    labels = []
+    for row in soup.find_all("tr"):
+        cell = row.find(["th", "td"])
+        if cell is None:
+            continue
+        label = cell.get_text(" ", strip=True)
+        if not label or not any(ch.isalpha() for ch in label) or label in labels:
+            continue
+        labels.append(label)
+    return "; ".join(labels)
+
+
+def _table_plain_text(table_html: str) -> str:
+    return BeautifulSoup(table_html, "html.parser").get_text(" ", strip=True)
+
+
+def _summary_or_fallback(summary: str, fallback_text: str, label: str) -> str:
+    """Returns the summary, or a CHUNK_SIZE prefix of the chunk text when the summary is blank."""
+    if summary and summary.strip():
+        return summary
+    print(f"[WARN] Empty summary for {label}; embedding the first {CHUNK_SIZE} chars of its content instead")
+    return fallback_text[:CHUNK_SIZE]
+
+
+def _embed_documents(documents: List[Document], embedding_model, persist_directory: str) -> Tuple[Chroma, dict]:
+    start = time.perf_counter()
+    vector_store = Chroma.from_documents(
+        documents=documents,
+        embedding=embedding_model,
+        persist_directory=persist_directory
+    )
+    elapsed = time.perf_counter() - start
+    total_chars = sum(len(doc.page_content) for doc in documents)
+    print(f"[INFO] Embedded {len(documents)} documents ({total_chars} chars) in {elapsed:.2f}s -> {persist_directory}")
+    build_stats = {"documents": len(documents), "chars": total_chars, "embed_s": elapsed}
+    return vector_store, build_stats
+
+
+class _SummaryStoreMixin:
+    """
+    Shared logic for the summary-based (multi-vector) mode.
+
+    Only the summaries are embedded in Chroma; the full chunks are kept in a
+    file-backed document store next to it and returned on retrieval.
+    """
+
+    @property
+    def docstore_directory(self) -> str:
+        return self.persist_directory.rstrip("/\\") + "_docstore"
+
+    def _clear_summary_store(self):
+        """Drops a previous build so rebuilding into the same directory leaves no orphaned parents or duplicate summaries."""
+        if os.path.isdir(self.docstore_directory):
+            shutil.rmtree(self.docstore_directory)
+        if os.path.isdir(self.persist_directory):
+            Chroma(
+                persist_directory=self.persist_directory,
+                embedding_function=self.embedding_model
+            ).delete_collection()
+
+    def get_docstore(self):
+        return create_kv_docstore(LocalFileStore(self.docstore_directory))
+
+    def _get_summary_retriever(self, vector_store: Chroma, lambda_mult: float) -> MultiVectorRetriever:
+        return MultiVectorRetriever(
+            vectorstore=vector_store,
+            docstore=self.get_docstore(),
+            id_key=DOC_ID_KEY,
+            search_type=SearchType.mmr,
+            search_kwargs={"k": 5, "lambda_mult": lambda_mult}
+        )
+
+    def _build_summary_store(self, parents: List[Document], child_texts: List[str]) -> Tuple[Chroma, dict]:
+        doc_ids = [str(uuid.uuid4()) for _ in parents]
+        children = []
+        for doc_id, parent, child_text in zip(doc_ids, parents, child_texts):
+            metadata = {k: v for k, v in parent.metadata.items() if k != "summary"}
+            metadata[DOC_ID_KEY] = doc_id
+            children.append(Document(page_content=child_text, metadata=metadata))
+
+        self._clear_summary_store()
+        self.get_docstore().mset(list(zip(doc_ids, parents)))
+        return _embed_documents(children, self.embedding_model, self.persist_directory)
+
+
+class TextVectorStoreBuilder(_SummaryStoreMixin):
+    def __init__(self, persist_directory: str, use_summaries: bool = False):
         self.persist_directory = persist_directory
+        self.use_summaries = use_summaries
+        self.last_build_stats = {}
         self.embedding_model = HuggingFaceEmbeddings(
             model_name=TEXT_EMBEDDING_MODEL_NAME
         )
-        
+
     def get_retriever(self, vector_store: Chroma):
+        if self.use_summaries:
+            return self._get_summary_retriever(vector_store, lambda_mult=0.7)
         retriever = vector_store.as_retriever(
             search_type="mmr",
             search_kwargs={"k": 5, "lambda_mult": 0.7}
@@ -21,56 +138,50 @@ class TextVectorStoreBuilder:
         return retriever
 
     def build_store_and_retriever(self, text_chunks: List, text_summaries: List[str]) -> Tuple[Chroma, any]:
-        documents = []
-        for chunk, summary in zip(text_chunks, text_summaries):
-            doc = Document(
-                page_content=chunk.text,
-                metadata={
-                    **chunk.metadata,
-                    "summary": summary
-                }
-            )
-            documents.append(doc)
+        documents = _build_parent_documents(text_chunks, text_summaries)
 
-        vector_store = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embedding_model,
-            persist_directory=self.persist_directory
-        )
+        if self.use_summaries:
+            child_texts = [
+                _summary_or_fallback(summary, chunk.text, f"text chunk #{i}")
+                for i, (chunk, summary) in enumerate(zip(text_chunks, text_summaries))
+            ]
+            vector_store, self.last_build_stats = self._build_summary_store(documents, child_texts)
+        else:
+            vector_store, self.last_build_stats = _embed_documents(documents, self.embedding_model, self.persist_directory)
         retriever = self.get_retriever(vector_store)
         return vector_store, retriever
 
 
-class TableVectorStoreBuilder:
-    def __init__(self, persist_directory: str):
+class TableVectorStoreBuilder(_SummaryStoreMixin):
+    def __init__(self, persist_directory: str, use_summaries: bool = False, include_row_labels: bool = True):
         self.persist_directory = persist_directory
+        self.use_summaries = use_summaries
+        self.include_row_labels = include_row_labels
+        self.last_build_stats = {}
         self.embedding_model = HuggingFaceEmbeddings(
             model_name=TABLE_EMBEDDING_MODEL_NAME
         )
 
     def get_retriever(self, vector_store: Chroma):
+        if self.use_summaries:
+            return self._get_summary_retriever(vector_store, lambda_mult=0.8)
         retriever = vector_store.as_retriever(
-            search_type="mmr", 
+            search_type="mmr",
             search_kwargs={"k": 5, "lambda_mult": 0.8}
             )
         return retriever
-        
+
     def build_store_and_retriever(self, table_chunks: List, table_summaries: List[str]) -> Tuple[Chroma, any]:
-        documents = []
-        for chunk, summary in zip(table_chunks, table_summaries):
-            doc = Document(
-                page_content=chunk.text,
-                metadata={
-                    **chunk.metadata,
-                    "summary": summary
-                }
-            )
-            documents.append(doc)
+        documents = _build_parent_documents(table_chunks, table_summaries)
 
-        vector_store = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embedding_model,
-            persist_directory=self.persist_directory
-        )
+        if self.use_summaries:
+            child_texts = []
+            for i, (chunk, summary) in enumerate(zip(table_chunks, table_summaries)):
+                summary = _summary_or_fallback(summary, _table_plain_text(chunk.text), f"table #{i}")
+                row_labels = _extract_row_labels(chunk.text) if self.include_row_labels else ""
+                child_texts.append(f"{summary}\nRows: {row_labels}" if row_labels else summary)
+            vector_store, self.last_build_stats = self._build_summary_store(documents, child_texts)
+        else:
+            vector_store, self.last_build_stats = _embed_documents(documents, self.embedding_model, self.persist_directory)
         retriever = self.get_retriever(vector_store)
         return vector_store, retriever
@@ -1,3 +1,5 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.runnables import RunnableMap
 from langchain.prompts import PromptTemplate
 from langchain_google_genai import GoogleGenerativeAI
@@ -5,9 +7,8 @@ from config import GEMINI_API_KEY, CHAT_MODEL_NAME
 
 
 class RetrieverQATester:
-    def __init__(self, text_retriever, table_retriever):
-        self.text_retriever = text_retriever
-        self.table_retriever = table_retriever
+    def __init__(self, retriever):
+        self.retriever = retriever
         self.llm = GoogleGenerativeAI(
             model=CHAT_MODEL_NAME,
             google_api_key=GEMINI_API_KEY
@@ -37,10 +38,7 @@ class RetrieverQATester:
 
     def _combine_retrievers(self, inputs):
         query = inputs["question"]
-        text_docs = self.text_retriever.get_relevant_documents(query)
-        table_docs = self.table_retriever.get_relevant_documents(query)
-
-        all_docs = text_docs + table_docs
+        all_docs = self.retriever.get_relevant_documents(query)
         formatted_context = []
 
         for doc in all_docs:
@@ -53,3 +51,40 @@ class RetrieverQATester:
 
     def ask(self, question: str):
         return self.chain.invoke({"question": question}).strip()
+
+
+def compare_retrievers(
+    retrievers: Dict[str, Any],
+    labelled_queries: List[Tuple[str, str]],
+    builders: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compares retrievers (e.g. raw-content vs summary-based stores) on the same queries.
+
+    Each labelled query is a (question, expected_snippet) pair; a query counts as a hit
+    when any retrieved document contains the snippet. Returns hit rate and mean latency per
+    retriever, plus the embedding time of the matching builder in `builders` (same keys), if given.
+    """
+    builders = builders or {}
+    results = {}
+    for name, retriever in retrievers.items():
+        hits = 0
+        total_latency = 0.0
+        for question, expected_snippet in labelled_queries:
+            start = time.perf_counter()
+            docs = retriever.get_relevant_documents(question)
+            total_latency += time.perf_counter() - start
+            if any(expected_snippet.lower() in doc.page_content.lower() for doc in docs):
+                hits += 1
+
+        n = max(len(labelled_queries), 1)
+        results[name] = {"hit_rate": hits / n, "avg_latency_s": total_latency / n}
+        message = f"[INFO] {name}: hit rate {hits}/{len(labelled_queries)}, avg latency {total_latency / n:.3f}s"
+
+        build_stats = getattr(builders.get(name), "last_build_stats", {})
+        if build_stats:
+            results[name]["embed_s"] = build_stats["embed_s"]
+            results[name]["embedded_chars"] = build_stats["chars"]
+            message += f", embedding {build_stats['embed_s']:.2f}s for {build_stats['chars']} chars"
+        print(message)
+    return results